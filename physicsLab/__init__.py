@@ -9,6 +9,8 @@ from ._core import (
     get_current_experiment,
     elementXYZ_to_native,
     native_to_elementXYZ,
+    elementXYZ_to_native_batch,
+    native_to_elementXYZ_batch,
     ElementXYZ,
 )
 # 实验, 标签类型
@@ -19,7 +19,10 @@ from physicsLab import errors
 from physicsLab import _colorUtils
 from .web import User, _check_response
 from .enums import Category, Tag, ExperimentType, OpenMode
-from .typehint import Union, Optional, List, Dict, num_type, Self, Callable, Tuple, final, NoReturn
+from .typehint import Union, Optional, List, Dict, num_type, Self, Callable, Tuple, final, NoReturn, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import numpy as np
 
 class _ExperimentStack:
     data: List["_Experiment"] = []
@@ -85,6 +88,7 @@ class _Experiment:
             SAV_PATH_DIR = "physicsLabSav"
 
     open_mode: OpenMode
+    # 键为 _tools.position_key 生成的整数坐标
     _position2elements: Dict[Tuple[num_type, num_type, num_type], List["_ElementBase"]]
     _id2element: Dict[str, "_ElementBase"]
     Elements: List["_ElementBase"]
@@ -187,11 +191,11 @@ class _Experiment:
                 or not isinstance(z, (int, float)):
             raise TypeError
 
-        position = (_tools.round_data(x), _tools.round_data(y), _tools.round_data(z))
-        if position not in self._position2elements.keys():
+        position = _tools.round_xyz(x, y, z)
+        result = self._position2elements.get(_tools.position_key(*position))
+        if result is None:
             raise errors.ElementNotFound(f"{position} do not exist")
 
-        result: list = self._position2elements[position]
         return result[0] if len(result) == 1 else result
 
     @_check_not_closed
@@ -264,7 +268,7 @@ class _Experiment:
         self.CameraSave["TargetRotation"] = f"{self.TargetRotation.x},{self.TargetRotation.z},{self.TargetRotation.y}"
         self.PlSav["Experiment"]["CameraSave"] = json.dumps(self.CameraSave)
 
-        self.PlSav["Experiment"]["StatusSave"] = json.dumps(status_save, ensure_ascii=True, separators=(',', ': '))
+        self.PlSav["Experiment"]["StatusSave"] = json.dumps(status_save, ensure_ascii=True, separators=(',', ':'))
 
     @_check_not_closed
     def save(
@@ -693,7 +697,7 @@ class _ElementBase:
                 or not isinstance(z, (int, float)):
             raise TypeError
 
-        x, y, z = _tools.round_data(x), _tools.round_data(y), _tools.round_data(z)
+        x, y, z = _tools.round_xyz(x, y, z)
         assert hasattr(self, 'experiment')
         _Expe: _Experiment = self.experiment
 
@@ -705,10 +709,11 @@ class _ElementBase:
         self.data['Position'] = f"{x},{z},{y}"
 
         assert hasattr(self, '_position')
-        if self._position in _Expe._position2elements.keys():
-            _Expe._position2elements[self._position].append(self)
+        key = _tools.position_key(*self._position)
+        if key in _Expe._position2elements.keys():
+            _Expe._position2elements[key].append(self)
         else:
-            _Expe._position2elements[self._position] = [self]
+            _Expe._position2elements[key] = [self]
 
         return self
 
@@ -723,7 +728,8 @@ class _ElementBase:
     def get_position(self) -> _tools.position:
         ''' 获取元件的坐标 '''
         assert hasattr(self, '_position')
-        return copy.deepcopy(self._position)
+        # position不可变, 无需复制
+        return self._position
 
     @final
     def get_index(self) -> int:
@@ -783,3 +789,67 @@ def native_to_elementXYZ(
     if is_bigElement:
         y -= ElementXYZ._Y_AMEND
     return x, y, z
+
+def _check_batch_args(
+        xyz: "np.ndarray",
+        is_bigElement: Union[bool, "np.ndarray"],
+        inplace: bool,
+) -> Union[bool, "np.ndarray"]:
+    ''' 检查批量坐标转换的参数, 返回规范化后的is_bigElement (bool或形状为 (N,) 的bool数组) '''
+    import numpy as np
+
+    if not isinstance(xyz, np.ndarray) or not isinstance(inplace, bool):
+        raise TypeError
+    if xyz.ndim != 2 or xyz.shape[1] != 3:
+        raise ValueError(f"xyz must be an array of shape (N, 3), got {xyz.shape}")
+    if inplace and not np.issubdtype(xyz.dtype, np.floating):
+        raise TypeError("xyz must be a float array when inplace=True")
+
+    mask = np.asarray(is_bigElement, dtype=bool)
+    if mask.ndim == 0:
+        return bool(mask)
+    if mask.shape != (xyz.shape[0],):
+        raise ValueError(f"is_bigElement must be a bool or an array of shape ({xyz.shape[0]},), got {mask.shape}")
+    return mask
+
+def elementXYZ_to_native_batch(
+        xyz: "np.ndarray",
+        /,
+        is_bigElement: Union[bool, "np.ndarray"] = False,
+        inplace: bool = False,
+) -> "np.ndarray":
+    ''' 批量将元件坐标系转换为物实的坐标系 (需要numpy)
+        @param xyz: 形状为 (N, 3) 的坐标数组
+        @param is_bigElement: 是否为2体积的元件, 也可以是形状为 (N,) 的bool数组, 逐个指定
+        @param inplace: 直接修改xyz (要求为浮点数组), 避免为大数组分配新的内存
+    '''
+    mask = _check_batch_args(xyz, is_bigElement, inplace)
+
+    res = xyz if inplace else xyz.astype(float)
+    res *= (ElementXYZ._X_UNIT, ElementXYZ._Y_UNIT, ElementXYZ._Z_UNIT)
+    if mask is True:
+        res[:, 1] += ElementXYZ._Y_AMEND
+    elif mask is not False:
+        res[mask, 1] += ElementXYZ._Y_AMEND
+    return res
+
+def native_to_elementXYZ_batch(
+        xyz: "np.ndarray",
+        /,
+        is_bigElement: Union[bool, "np.ndarray"] = False,
+        inplace: bool = False,
+) -> "np.ndarray":
+    ''' 批量将物实的坐标系转换为元件坐标系 (需要numpy)
+        @param xyz: 形状为 (N, 3) 的坐标数组
+        @param is_bigElement: 是否为2体积的元件, 也可以是形状为 (N,) 的bool数组, 逐个指定
+        @param inplace: 直接修改xyz (要求为浮点数组), 避免为大数组分配新的内存
+    '''
+    mask = _check_batch_args(xyz, is_bigElement, inplace)
+
+    res = xyz if inplace else xyz.astype(float)
+    res /= (ElementXYZ._X_UNIT, ElementXYZ._Y_UNIT, ElementXYZ._Z_UNIT)
+    if mask is True:
+        res[:, 1] -= ElementXYZ._Y_AMEND
+    elif mask is not False:
+        res[mask, 1] -= ElementXYZ._Y_AMEND
+    return res
@@ -1,25 +1,43 @@
 # -*- coding: utf-8 -*-
-from random import choice
+from math import isfinite
+from random import choices
 from string import ascii_lowercase, ascii_letters, digits
 
-from collections import namedtuple
-from .typehint import num_type
+from .typehint import num_type, Tuple, NamedTuple
+
+_LOWER_ALPHABET = ascii_lowercase + digits
+_MIXED_ALPHABET = ascii_letters + digits
 
 # TODO 元件坐标系也应该由这玩意负责
-position = namedtuple("position", ["x", "y", "z"])
+class position(NamedTuple):
+    x: num_type
+    y: num_type
+    z: num_type
 
 def round_data(num: num_type) -> num_type:
     if not isinstance(num, (int, float)):
         raise TypeError
     return round(num, 6)
 
+def round_xyz(x: num_type, y: num_type, z: num_type) -> Tuple[num_type, num_type, num_type]:
+    ''' 同时对三个坐标进行round_data, 调用者需已检查过参数的类型 '''
+    return round(x, 6), round(y, 6), round(z, 6)
+
+def _coordinate_key(num: num_type) -> num_type:
+    # inf与nan无法转换为整数, 保留原值作为键
+    if not isfinite(num):
+        return num
+    return round(num * 1000000)
+
+def position_key(x: num_type, y: num_type, z: num_type) -> Tuple[num_type, num_type, num_type]:
+    ''' 将(已经过round_data的)坐标转换为索引元件用的整数键, 精度与round_data一致
+        非有限的坐标(inf, nan)保持为float
+    '''
+    return _coordinate_key(x), _coordinate_key(y), _coordinate_key(z)
+
 def randString(length: int, is_lower: bool = False) -> str:
     if not isinstance(length, int) \
             or not isinstance(is_lower, bool):
         raise TypeError
 
-    if is_lower:
-        letters = ascii_lowercase
-    else:
-        letters = ascii_letters
-    return ''.join(choice(letters + digits) for _ in range(length))
+    return ''.join(choices(_LOWER_ALPHABET if is_lower else _MIXED_ALPHABET, k=length))
@@ -27,7 +27,7 @@ class _PlanetMeta(type):
         self: "PlanetBase" = cls.__new__(cls)
         self.experiment = _Expe
 
-        x, y, z = _tools.round_data(x), _tools.round_data(y), _tools.round_data(z)
+        x, y, z = _tools.round_xyz(x, y, z)
 
         self.__init__(x, y, z, *args, **kwargs)
         assert isinstance(self.data, dict)
@@ -58,7 +58,7 @@ class PlanetBase(_ElementBase, metaclass=_PlanetMeta):
                 or not isinstance(z, (int, float)):
             raise TypeError
 
-        x, y, z = _tools.round_data(x), _tools.round_data(y), _tools.round_data(z)
+        x, y, z = _tools.round_xyz(x, y, z)
         self._position = _tools.position(x, y, z)
         return super().set_position(x, y, z)
 
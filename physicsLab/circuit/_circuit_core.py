@@ -5,7 +5,6 @@ from physicsLab import errors
 from physicsLab import _tools
 
 from physicsLab.enums import ExperimentType, WireColor
-from physicsLab._tools import round_data
 from physicsLab._core import _Experiment, get_current_experiment, _ElementBase, elementXYZ_to_native
 from physicsLab.typehint import Optional, Self, num_type, NoReturn, Generate, override, final, List
 
@@ -160,7 +159,7 @@ class _CircuitMeta(type):
         self: "CircuitBase" = cls.__new__(cls)
         self.experiment = _Expe
 
-        x, y, z = round_data(x), round_data(y), round_data(z)
+        x, y, z = _tools.round_xyz(x, y, z)
 
         self.__init__(x, y, z, *args, **kwargs)
         assert hasattr(self, "data") and isinstance(self.data, dict)
@@ -202,7 +201,7 @@ class CircuitBase(_ElementBase, metaclass=_CircuitMeta):
                 or not isinstance(z_r, (int, float)):
             raise TypeError
 
-        x_r, y_r, z_r = round_data(x_r), round_data(y_r), round_data(z_r)
+        x_r, y_r, z_r = _tools.round_xyz(x_r, y_r, z_r)
         self.data["Rotation"] = f"{x_r},{z_r},{y_r}"
         return self
 
@@ -216,7 +215,7 @@ class CircuitBase(_ElementBase, metaclass=_CircuitMeta):
                 or not isinstance(elementXYZ, (bool, type(None))):
             raise TypeError
 
-        x, y, z = round_data(x), round_data(y), round_data(z)
+        x, y, z = _tools.round_xyz(x, y, z)
         self._position = _tools.position(x, y, z)
 
         # 元件坐标系
@@ -53,7 +53,7 @@ class ElectromagnetismBase(_ElementBase, metaclass=_ElectromagnetismMeta):
                 or not isinstance(z, (int, float)):
             raise TypeError
 
-        x, y, z= _tools.round_data(x), _tools.round_data(y), _tools.round_data(z)
+        x, y, z = _tools.round_xyz(x, y, z)
         self._position = _tools.position(x, y, z)
         return super().set_position(x, y, z)
 
@@ -70,6 +70,6 @@ class ElectromagnetismBase(_ElementBase, metaclass=_ElectromagnetismMeta):
             raise TypeError
 
         assert hasattr(self, "data")
-        x_r, y_r, z_r = _tools.round_data(x_r), _tools.round_data(y_r), _tools.round_data(z_r)
+        x_r, y_r, z_r = _tools.round_xyz(x_r, y_r, z_r)
         self.data["Rotation"] = f"{x_r},{z_r},{y_r}"
         return self
@@ -1,6 +1,5 @@
 # -*- coding: utf-8 -*-
 import os
-import copy
 import json
 import pathlib
 
@@ -15,61 +14,185 @@ from .savTemplate import Generate
 from .circuit._circuit_core import crt_wire, Pin
 from .enums import ExperimentType, Category, OpenMode, WireColor
 from ._core import _Experiment, _ExperimentStack, _check_not_closed, _ElementBase
-from .typehint import num_type, Optional, Union, List, overload, Tuple, Dict, Self
+from .typehint import num_type, Optional, Union, List, overload, Tuple, Dict, Self, Type
 
-def _get_all_pl_sav() -> List[str]:
-    ''' 获取所有物实存档的文件名 '''
-    savs = [i for i in os.walk(_Experiment.SAV_PATH_DIR)][0][-1]
-    return [aSav for aSav in savs if aSav.endswith('.sav')]
+try:
+    import orjson # type: ignore
+except ImportError: # orjson 是可选的依赖, 仅用于加速读取存档
+    orjson = None
+
+try:
+    import chardet # type: ignore
+except ImportError: # chardet 是可选的依赖, 用于检测非utf-8存档的编码
+    chardet = None
+
+def _collect_elements(module, base: Type[_ElementBase]) -> Dict[str, Type[_ElementBase]]:
+    ''' 收集模块中所有的元件类, 返回 类名 -> 类 的映射
+        @param base: 该模块元件的基类, 基类本身不是元件, 不会被收集
+    '''
+    return {
+        name: obj for name, obj in vars(module).items()
+        if isinstance(obj, type) and issubclass(obj, base) and obj is not base
+    }
+
+# 通过元件的类名 (或ModelID) 索引元件类
+_CIRCUIT_ELEMENTS: Dict[str, Type[_ElementBase]] = _collect_elements(circuit, circuit.CircuitBase)
+# ModelID 与类名不一致的元件
+_CIRCUIT_ELEMENTS.update({
+    "555_Timer": circuit.NE555,
+    "8bit_Input": circuit.Eight_Bit_Input,
+    "8bit_Display": circuit.Eight_Bit_Display,
+})
+_CELESTIAL_ELEMENTS: Dict[str, Type[_ElementBase]] = _collect_elements(celestial, celestial.PlanetBase)
+_ELECTROMAGNETISM_ELEMENTS: Dict[str, Type[_ElementBase]] = _collect_elements(electromagnetism, electromagnetism.ElectromagnetismBase)
+# 实验类型 -> 该类型实验的元件类索引
+_EXPERIMENT_ELEMENTS: Dict[ExperimentType, Dict[str, Type[_ElementBase]]] = {
+    ExperimentType.Circuit: _CIRCUIT_ELEMENTS,
+    ExperimentType.Celestial: _CELESTIAL_ELEMENTS,
+    ExperimentType.Electromagnetism: _ELECTROMAGNETISM_ELEMENTS,
+}
+
+def _copy_template(template):
+    ''' 复制只读的sav模板
+        模板仅由dict, list与不可变对象组成, 因此无需copy.deepcopy的memo等开销
+    '''
+    if type(template) is dict:
+        return {key: _copy_template(val) for key, val in template.items()}
+    if type(template) is list:
+        return [_copy_template(val) for val in template]
+    return template
+
+def _parse_vec3(s: str) -> Tuple[float, float, float]:
+    ''' 解析存档中形如 "x,y,z" 的三维向量字符串 '''
+    a, b, c = s.strip("() \t").split(',')
+    return float(a), float(b), float(c)
+
+# 存档的绝对路径 -> (修改时间, 文件大小, 存档的编码) (仅记录非utf-8编码的存档)
+# 存档的修改时间或大小变化后, 缓存的编码不再被使用
+_SAV_ENCODINGS: Dict[str, Tuple[int, int, str]] = {}
+# chardet 最多检测存档的前 64 KiB
+_CHARDET_MAX_BYTES = 64 * 1024
 
 def _open_sav(sav_path) -> dict:
     ''' 打开一个存档, 返回存档对应的dict
         @param sav_path: 存档的绝对路径
     '''
-    def encode_sav(path: str, encoding: str) -> Optional[dict]:
+    def encode_sav(data: bytes, encoding: str) -> Optional[dict]:
         try:
-            with open(path, encoding=encoding) as f:
-                d = json.loads(f.read().replace('\n', ''))
-        except (json.decoder.JSONDecodeError, UnicodeDecodeError): # 文件不是物实存档
+            # strict=False: 允许字符串中出现未转义的换行符
+            d = json.loads(data.decode(encoding), strict=False)
+        except (json.decoder.JSONDecodeError, UnicodeDecodeError, LookupError): # 文件不是物实存档
             return None
         else:
             return d
 
     assert os.path.exists(sav_path)
 
-    res = encode_sav(sav_path, "utf-8")
+    with open(sav_path, "rb") as f:
+        stat = os.fstat(f.fileno())
+        data = f.read()
+
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError: # 如: 带BOM, 字符串中有未转义的换行符, 非utf-8编码
+            pass
+
+    # 必须先尝试utf-8: 存档保存后总是utf-8编码, 缓存的编码可能已经过期
+    res = encode_sav(data, "utf-8")
     if res is not None:
         return res
 
-    try:
-        import chardet # type: ignore
-    except ImportError:
-        for encoding in ("utf-8-sig", "gbk"):
-            res = encode_sav(sav_path, encoding)
-            if res is not None:
-                return res
-    else:
-        with open(sav_path, "rb") as f:
-            encoding = chardet.detect(f.read())["encoding"]
-        res = encode_sav(sav_path, encoding)
+    abs_path = os.path.abspath(sav_path)
+    cached = _SAV_ENCODINGS.get(abs_path)
+    if cached is not None and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+        res = encode_sav(data, cached[2])
+        if res is not None:
+            return res
+
+    encodings = ["utf-8-sig", "gbk"]
+    if chardet is not None:
+        # 分块检测编码, 置信度足够或已检测 _CHARDET_MAX_BYTES 字节时结束, 避免对整个文件进行检测
+        # 只检测了文件开头, 结果可能不准确, 因此检测失败时仍会尝试 utf-8-sig 与 gbk
+        detector = chardet.UniversalDetector()
+        for i in range(0, min(len(data), _CHARDET_MAX_BYTES), 4096):
+            detector.feed(data[i:i + 4096])
+            if detector.done:
+                break
+        encoding = detector.close()["encoding"]
+        if encoding is not None:
+            encodings.insert(0, encoding)
+
+    for encoding in encodings:
+        res = encode_sav(data, encoding)
         if res is not None:
+            _SAV_ENCODINGS[abs_path] = (stat.st_mtime_ns, stat.st_size, encoding)
             return res
 
     raise errors.InvalidSavError
 
+# 存档目录的索引: 文件名 -> (修改时间, 文件大小, 存档名 (InternalName))
+# 每次查找时都会重新扫描存档目录, 仅重新读取修改时间或大小发生变化的存档
+_SAV_INDEX: Dict[str, Tuple[int, int, Optional[str]]] = {}
+# _SAV_INDEX 对应的存档目录
+_SAV_INDEX_DIR: Optional[str] = None
+
+def _invalidate_sav_index() -> None:
+    ''' 使存档索引失效, 下次查找时重新读取所有存档 '''
+    _SAV_INDEX.clear()
+
 def search_experiment(sav_name: str) -> Tuple[Optional[str], Optional[dict]]:
     ''' 检测实验是否存在
         @param sav_name: 存档名
 
         若存在则返回存档对应的文件名, 若不存在则返回None
     '''
-    for a_sav in _get_all_pl_sav():
-        try:
-            sav = _open_sav(os.path.join(_Experiment.SAV_PATH_DIR, a_sav))
-        except errors.InvalidSavError:
-            continue
-        if sav["InternalName"] == sav_name:
-            return a_sav, sav
+    global _SAV_INDEX_DIR
+
+    if _SAV_INDEX_DIR != _Experiment.SAV_PATH_DIR:
+        _invalidate_sav_index()
+        _SAV_INDEX_DIR = _Experiment.SAV_PATH_DIR
+
+    # 文件名均来自目录本身, 直接拼接前缀即可, 无需对每个文件调用os.path.join
+    sav_dir = os.path.join(_Experiment.SAV_PATH_DIR, '')
+    seen = set()
+    with os.scandir(_Experiment.SAV_PATH_DIR) as entries:
+        for entry in entries:
+            if not entry.name.endswith('.sav') or not entry.is_file():
+                continue
+            seen.add(entry.name)
+
+            stat = entry.stat()
+            cached = _SAV_INDEX.get(entry.name)
+            if cached is not None and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+                if cached[2] != sav_name:
+                    continue
+                sav = None
+            else:
+                try:
+                    sav = _open_sav(sav_dir + entry.name)
+                except errors.InvalidSavError:
+                    sav = None
+                internal_name = sav.get("InternalName") if isinstance(sav, dict) else None
+                _SAV_INDEX[entry.name] = (stat.st_mtime_ns, stat.st_size, internal_name)
+                if internal_name != sav_name:
+                    continue
+
+            # 每次都重新读取存档, 避免不同的实验共享同一个dict
+            if sav is None:
+                try:
+                    sav = _open_sav(sav_dir + entry.name)
+                except errors.InvalidSavError:
+                    continue
+            internal_name = sav.get("InternalName") if isinstance(sav, dict) else None
+            if internal_name == sav_name:
+                return entry.name, sav
+            # 存档在修改时间与大小都不变的情况下被改写了
+            _SAV_INDEX[entry.name] = (stat.st_mtime_ns, stat.st_size, internal_name)
+
+    # 完整扫描过目录后, 移除已被删除的存档
+    for filename in _SAV_INDEX.keys() - seen:
+        del _SAV_INDEX[filename]
 
     return None, None
 
@@ -156,11 +279,11 @@ class Experiment(_Experiment):
                 self.PlSav = _temp
             else: # 读取物实导出的存档只含有.sav的Experiment部分
                 if _temp["Type"] == ExperimentType.Circuit.value:
-                    self.PlSav = copy.deepcopy(savTemplate.Circuit)
+                    self.PlSav = _copy_template(savTemplate.Circuit)
                 elif _temp["Type"] == ExperimentType.Celestial.value:
-                    self.PlSav = copy.deepcopy(savTemplate.Celestial)
+                    self.PlSav = _copy_template(savTemplate.Celestial)
                 elif _temp["Type"] == ExperimentType.Electromagnetism.value:
-                    self.PlSav = copy.deepcopy(savTemplate.Electromagnetism)
+                    self.PlSav = _copy_template(savTemplate.Electromagnetism)
                 else:
                     assert False
 
@@ -208,11 +331,11 @@ class Experiment(_Experiment):
             del _experiment["$type"]
 
             if _experiment["Type"] == ExperimentType.Circuit.value:
-                self.PlSav = copy.deepcopy(savTemplate.Circuit)
+                self.PlSav = _copy_template(savTemplate.Circuit)
             elif _experiment["Type"] == ExperimentType.Celestial.value:
-                self.PlSav = copy.deepcopy(savTemplate.Celestial)
+                self.PlSav = _copy_template(savTemplate.Celestial)
             elif _experiment["Type"] == ExperimentType.Electromagnetism.value:
-                self.PlSav = copy.deepcopy(savTemplate.Electromagnetism)
+                self.PlSav = _copy_template(savTemplate.Electromagnetism)
             else:
                 assert False
 
@@ -245,7 +368,7 @@ class Experiment(_Experiment):
 
             if self.experiment_type == ExperimentType.Circuit:
                 self._is_elementXYZ: bool = False
-                self.PlSav: dict = copy.deepcopy(savTemplate.Circuit)
+                self.PlSav: dict = _copy_template(savTemplate.Circuit)
                 self.Wires: set = set() # Set[Wire] # 存档对应的导线
                 # 存档对应的StatusSave, 存放实验元件，导线（如果是电学实验的话）
                 self.CameraSave: dict = {
@@ -254,14 +377,14 @@ class Experiment(_Experiment):
                 self.VisionCenter: _tools.position = _tools.position(0, -0.45, 1.08)
                 self.TargetRotation: _tools.position = _tools.position(50, 0, 0)
             elif self.experiment_type == ExperimentType.Celestial:
-                self.PlSav: dict = copy.deepcopy(savTemplate.Celestial)
+                self.PlSav: dict = _copy_template(savTemplate.Celestial)
                 self.CameraSave: dict = {
                     "Mode": 2, "Distance": 2.75, "VisionCenter": Generate, "TargetRotation": Generate
                 }
                 self.VisionCenter: _tools.position = _tools.position(0 ,0, 1.08)
                 self.TargetRotation: _tools.position = _tools.position(90, 0, 0)
             elif self.experiment_type == ExperimentType.Electromagnetism:
-                self.PlSav: dict = copy.deepcopy(savTemplate.Electromagnetism)
+                self.PlSav: dict = _copy_template(savTemplate.Electromagnetism)
                 self.CameraSave: dict = {
                     "Mode": 0, "Distance": 3.25, "VisionCenter": Generate, "TargetRotation": Generate,
                 }
@@ -274,26 +397,14 @@ class Experiment(_Experiment):
         else:
             assert False
 
-        assert isinstance(self.open_mode, OpenMode)
-        assert isinstance(self._position2elements, dict)
-        assert isinstance(self._id2element, dict)
-        assert isinstance(self.Elements, list)
-        assert isinstance(self.SAV_PATH, str)
-        assert isinstance(self.PlSav, dict)
-        assert isinstance(self.CameraSave, dict)
-        assert isinstance(self.VisionCenter, _tools.position)
-        assert isinstance(self.TargetRotation, _tools.position)
-        assert isinstance(self.experiment_type, ExperimentType)
-        if self.experiment_type == ExperimentType.Circuit:
-            assert isinstance(self.Wires, set)
-            assert isinstance(self._is_elementXYZ, bool)
-
         _ExperimentStack.push(self)
 
         if self.open_mode == OpenMode.load_by_sav_name \
                 or self.open_mode == OpenMode.load_by_filepath \
                 or self.open_mode == OpenMode.load_by_plar_app:
             status_sav = json.loads(self.PlSav["Experiment"]["StatusSave"])
+            # 保存时会根据元件与导线重新生成StatusSave, 无需继续持有这个 (可能很大的) 字符串
+            self.PlSav["Experiment"]["StatusSave"] = Generate
 
             if self.experiment_type == ExperimentType.Circuit:
                 self.__load_elements(status_sav["Elements"])
@@ -308,13 +419,13 @@ class Experiment(_Experiment):
     def __load(self) -> None:
         assert isinstance(self.PlSav["Experiment"]["CameraSave"], str)
         self.CameraSave = json.loads(self.PlSav["Experiment"]["CameraSave"])
-        temp = eval(f"({self.CameraSave['VisionCenter']})")
+        temp = _parse_vec3(self.CameraSave["VisionCenter"])
         self.VisionCenter: _tools.position = _tools.position(temp[0], temp[2], temp[1]) # x, z, y
-        temp = eval(f"({self.CameraSave['TargetRotation']})")
+        temp = _parse_vec3(self.CameraSave["TargetRotation"])
         self.TargetRotation: _tools.position = _tools.position(temp[0], temp[2], temp[1]) # x, z, y
 
         if self.PlSav["Summary"] is None:
-            self.PlSav["Summary"] = savTemplate.Circuit["Summary"]
+            self.PlSav["Summary"] = _copy_template(savTemplate.Circuit["Summary"])
 
         if self.PlSav["Experiment"]["Type"] == ExperimentType.Circuit.value:
             self.experiment_type = ExperimentType.Circuit
@@ -354,20 +465,21 @@ class Experiment(_Experiment):
     def __load_elements(self, _elements: list) -> None:
         assert isinstance(_elements, list)
 
-        for element in _elements:
-            # Unity 采用左手坐标系
-            x, z, y = eval(f"({element['Position']})")
+        # 先集中解析所有元件的坐标, 再逐个实例化元件
+        # Unity 采用左手坐标系, 存档中的坐标为 x, z, y
+        positions = [_parse_vec3(element["Position"]) for element in _elements]
 
-            # 实例化对象
-            if self.experiment_type == ExperimentType.Circuit:
+        if self.experiment_type == ExperimentType.Circuit:
+            rotations = [_parse_vec3(element["Rotation"]) for element in _elements]
+
+            for element, (x, z, y), (r_x, r_z, r_y) in zip(_elements, positions, rotations):
                 if element["ModelID"] == "Simple Instrument":
-                    from .circuit.elements.otherCircuit import Simple_Instrument
                     pitches = []
                     for attr, val in element["Properties"].items():
                         if attr.startswith("音高"):
                             pitches.append(int(val))
 
-                    obj = Simple_Instrument(
+                    obj = circuit.Simple_Instrument(
                         x, y, z,
                         pitches=pitches,
                         identifier=element["Identifier"],
@@ -384,18 +496,17 @@ class Experiment(_Experiment):
                     )
                     obj.data["Properties"] = element["Properties"]
                 # 设置角度信息
-                rotation = eval(f'({element["Rotation"]})')
-                r_x, r_y, r_z = rotation[0], rotation[2], rotation[1]
                 obj.set_rotation(r_x, r_y, r_z)
-
-            elif self.experiment_type == ExperimentType.Celestial:
+        elif self.experiment_type == ExperimentType.Celestial:
+            for element, (x, z, y) in zip(_elements, positions):
                 obj = self.crt_element(element["Model"], x, y, z, identifier=element['Identifier'])
                 obj.data = element
-            elif self.experiment_type == ExperimentType.Electromagnetism:
+        elif self.experiment_type == ExperimentType.Electromagnetism:
+            for element, (x, z, y) in zip(_elements, positions):
                 obj = self.crt_element(element["ModelID"], x, y, z, identifier=element['Identifier'])
                 obj.data = element
-            else:
-                assert False
+        else:
+            assert False
 
     def __enter__(self) -> Self:
         return self
@@ -407,6 +518,26 @@ class Experiment(_Experiment):
                 self.save()
             self.close(delete=False)
 
+    def save(
+            self,
+            target_path: Optional[str] = None,
+            no_print_info: bool = False,
+    ) -> Self:
+        ''' 以物实存档的格式导出实验
+            @param target_path: 将存档保存在此路径 (要求必须是file), 默认为 SAV_PATH
+            @param no_print_info: 是否打印写入存档的元件数, 导线数(如果是电学实验的话)
+        '''
+        super().save(target_path, no_print_info)
+
+        # 在文件系统的时间精度内覆写存档时, 存档的修改时间与大小可能都不变
+        # 因此仅使刚写入的存档在索引中失效, 其余存档的变化由search_experiment检测
+        if target_path is None:
+            target_path = self.SAV_PATH
+        target_path = os.path.abspath(target_path)
+        if os.path.dirname(target_path) == os.path.abspath(_Experiment.SAV_PATH_DIR):
+            _SAV_INDEX.pop(os.path.basename(target_path), None)
+        return self
+
     @_check_not_closed
     def crt_element(
             self,
@@ -425,20 +556,9 @@ class Experiment(_Experiment):
             raise TypeError
 
         name = name.strip().replace(' ', '_').replace('-', '_')
-        x, y, z = _tools.round_data(x), _tools.round_data(y), _tools.round_data(z)
+        x, y, z = _tools.round_xyz(x, y, z)
 
-        if self.experiment_type == ExperimentType.Circuit:
-            if name == "555_Timer":
-                return circuit.NE555(x, y, z, *args, **kwargs)
-            elif name == "8bit_Input":
-                return circuit.Eight_Bit_Input(x, y, z, *args, **kwargs)
-            elif name == "8bit_Display":
-                return circuit.Eight_Bit_Display(x, y, z, *args, **kwargs)
-            else:
-                return eval(f"circuit.{name}({x}, {y}, {z}, *{args}, **{kwargs})")
-        elif self.experiment_type == ExperimentType.Celestial:
-            return eval(f"celestial.{name}({x}, {y}, {z}, **{kwargs})")
-        elif self.experiment_type == ExperimentType.Electromagnetism:
-            return eval(f"electromagnetism.{name}({x}, {y}, {z}, **{kwargs})")
-        else:
-            assert False
+        cls = _EXPERIMENT_ELEMENTS[self.experiment_type].get(name)
+        if cls is None:
+            raise errors.ElementNotFound(f"no element named \"{name}\" in {self.experiment_type}")
+        return cls(x, y, z, *args, **kwargs)
@@ -3,7 +3,7 @@ import physicsLab.errors as errors
 
 from .super_logic_gate import Const_NoGate, Super_AndGate
 from .wires import UnitPin, crt_wires
-from physicsLab._tools import round_data
+from physicsLab._tools import round_xyz
 from physicsLab.circuit import elements
 from physicsLab.circuit._circuit_core import Pin
 from physicsLab._core import get_current_experiment, native_to_elementXYZ
@@ -32,7 +32,7 @@ class Tick_Counter:
 
         if elementXYZ is not True and not (get_current_experiment().is_elementXYZ is True and elementXYZ is None):
             x, y, z = native_to_elementXYZ(x, y, z)
-        x, y, z = round_data(x), round_data(y), round_data(z)
+        x, y, z = round_xyz(x, y, z)
         self.bitnum = bitnum
 
         if bitnum == 2:
@@ -101,7 +101,7 @@ class Two_four_Decoder:
         # 元件坐标系，如果输入坐标不是元件坐标系就强转为元件坐标系
         if elementXYZ is not True and not (get_current_experiment().is_elementXYZ is True and elementXYZ is None):
             x, y, z = native_to_elementXYZ(x, y, z)
-        x, y, z = round_data(x), round_data(y), round_data(z)
+        x, y, z = round_xyz(x, y, z)
 
         self.nor_gate = elements.Nor_Gate(x, y, z, elementXYZ=True)
         self.nimp_gate1 = elements.Nimp_Gate(x + 1, y, z, elementXYZ=True)
@@ -153,7 +153,7 @@ class Switched_Register:
 
         if elementXYZ is not True and not (get_current_experiment().is_elementXYZ is True and elementXYZ is None):
             x, y, z = native_to_elementXYZ(x, y, z)
-        x, y, z = round_data(x), round_data(y), round_data(z)
+        x, y, z = round_xyz(x, y, z)
         self.bitnum = bitnum
 
         self.register = Register(x + 1, y, z, bitnum, elementXYZ=True, heading=False)
@@ -209,7 +209,7 @@ class EqualTo:
 
         if elementXYZ is not True and not (get_current_experiment().is_elementXYZ is True and elementXYZ is None):
             x, y, z = native_to_elementXYZ(x, y, z)
-        x, y, z = round_data(x), round_data(y), round_data(z)
+        x, y, z = round_xyz(x, y, z)
         self.bitnum = bitnum
 
         self.xnorgates = []
@@ -250,7 +250,7 @@ class Signed_Sum:
 
         if elementXYZ is not True and not (get_current_experiment().is_elementXYZ is True and elementXYZ is None):
             x, y, z = native_to_elementXYZ(x, y, z)
-        x, y, z = round_data(x), round_data(y), round_data(z)
+        x, y, z = round_xyz(x, y, z)
         self.bitnum = bitnum
 
         self._inputs = AU_SumSub(x, y, z, bitnum=bitnum, elementXYZ=True)
@@ -323,7 +323,7 @@ class _Simple_Logic_Meta(type):
         # 元件坐标系，如果输入坐标不是元件坐标系就强转为元件坐标系
         if elementXYZ is not True and not (get_current_experiment().is_elementXYZ is True and elementXYZ is None):
             x, y, z = native_to_elementXYZ(x, y, z)
-        x, y, z = round_data(x), round_data(y), round_data(z)
+        x, y, z = round_xyz(x, y, z)
 
         self.__init__(x=x,
                       y=y,
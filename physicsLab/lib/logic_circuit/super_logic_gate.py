@@ -1,6 +1,6 @@
 # -*- coding: utf-8 -*-
 from .wires import crt_wires, UnitPin
-from physicsLab._tools import round_data
+from physicsLab._tools import round_xyz
 from physicsLab.circuit import elements, Pin, crt_wire
 from physicsLab._core import _Experiment, get_current_experiment, native_to_elementXYZ
 from physicsLab.typehint import num_type, Dict, Optional, List
@@ -55,7 +55,7 @@ class Super_AndGate:
 
         if elementXYZ is not True and not (get_current_experiment().is_elementXYZ is True and elementXYZ is None):
             x, y, z = native_to_elementXYZ(x, y, z)
-        x, y, z = round_data(x), round_data(y), round_data(z)
+        x, y, z = round_xyz(x, y, z)
         self.bitnum = bitnum
 
         if bitnum == 2:
@@ -135,7 +135,7 @@ class Super_OrGate:
 
         if elementXYZ is not True and not (get_current_experiment().is_elementXYZ is True and elementXYZ is None):
             x, y, z = native_to_elementXYZ(x, y, z)
-        x, y, z = round_data(x), round_data(y), round_data(z)
+        x, y, z = round_xyz(x, y, z)
         self.bitnum = bitnum
 
         if bitnum == 2:
@@ -200,7 +200,7 @@ class Super_NorGate:
 
         if elementXYZ is not True and not (get_current_experiment().is_elementXYZ is True and elementXYZ is None):
             x, y, z = native_to_elementXYZ(x, y, z)
-        x, y, z = round_data(x), round_data(y), round_data(z)
+        x, y, z = round_xyz(x, y, z)
         self.bitnum = bitnum
 
         if bitnum == 2:
@@ -12,7 +12,7 @@ from . import mido
 from physicsLab import errors
 from physicsLab._core import get_current_experiment, native_to_elementXYZ
 from physicsLab.circuit import elements, crt_wire
-from physicsLab._tools import round_data
+from physicsLab._tools import round_xyz
 from physicsLab.lib import crt_wires, D_WaterLamp
 from physicsLab.typehint import Optional, Union, List, Iterator, Dict, Self, num_type, Callable, Type
 
@@ -485,7 +485,7 @@ class Chord:
         # 元件坐标系，如果输入坐标不是元件坐标系就强转为元件坐标系
         if elementXYZ is not True and not (get_current_experiment().is_elementXYZ is True and elementXYZ is None):
             x, y, z = native_to_elementXYZ(x, y, z)
-        x, y, z = round_data(x), round_data(y), round_data(z)
+        x, y, z = round_xyz(x, y, z)
 
         first_ins: Optional[elements.Simple_Instrument] = None # 第一个音符
         if is_optimize:
@@ -1,12 +1,21 @@
 # -*- coding: utf-8 -*-
 import os
+import copy
+import json
 import sys
 import pathlib
 import threading
+import unittest
 from .base import *
 from physicsLab.lib import *
+from physicsLab import savTemplate
 from physicsLab._core import _ExperimentStack
 
+try:
+    import numpy as np
+except ImportError: # CI 不安装numpy
+    np = None
+
 def my_test_dec(method: Callable):
     def result(*args, **kwarg):
         method(*args, **kwarg)
@@ -590,3 +599,148 @@ class BasicTest(TestCase, ViztracerTool):
             pass
         else:
             raise TestFail
+
+    @my_test_dec
+    def test_crt_element_by_model_id(self):
+        with Experiment(OpenMode.crt, "__test__", ExperimentType.Circuit, force_crt=True) as expe:
+            self.assertIsInstance(expe.crt_element("555 Timer", 0, 0, 0), NE555)
+            self.assertIsInstance(expe.crt_element("8bit Input", 1, 0, 0), Eight_Bit_Input)
+            self.assertIsInstance(expe.crt_element("Yes Gate", 2, 0, 0), Yes_Gate)
+            try:
+                for name in ("Earth", "CircuitBase"):
+                    try:
+                        expe.crt_element(name, 3, 0, 0)
+                    except ElementNotFound:
+                        pass
+                    else:
+                        raise TestFail
+            finally:
+                expe.close(delete=True)
+
+    @my_test_dec
+    def test_non_finite_position(self):
+        with Experiment(OpenMode.crt, "__test__", ExperimentType.Celestial, force_crt=True) as expe:
+            earth = expe.crt_element("Earth", float("inf"), 0, 0)
+            expe.crt_element("Earth", float("nan"), 0, 0)
+            self.assertIs(expe.get_element_from_position(float("inf"), 0, 0), earth)
+            expe.save()
+            sav_path = expe.SAV_PATH
+
+        with Experiment(OpenMode.load_by_filepath, sav_path) as expe:
+            self.assertEqual(expe.get_elements_count(), 2)
+            expe.get_element_from_position(float("inf"), 0, 0)
+            expe.close(delete=True)
+
+    @my_test_dec
+    def test_search_experiment_after_entitle(self):
+        expe = Experiment(OpenMode.crt, "__test__", ExperimentType.Circuit, force_crt=True)
+        expe.save()
+        self.assertIsNotNone(search_experiment("__test__")[0])
+        expe.entitle("__test_entitle__")
+        expe.save()
+        self.assertEqual(search_experiment("__test__"), (None, None))
+        expe.close()
+
+        expe = Experiment(OpenMode.load_by_sav_name, "__test_entitle__")
+        expe.entitle("__test__")
+        self.assertEqual(search_experiment("__test_entitle__")[1]["InternalName"], "__test_entitle__")
+        expe.close(delete=True)
+
+    @my_test_dec
+    def test_resave_gbk_sav(self):
+        with open(os.path.join(TEST_DATA_DIR, "All-Circuit-Elements.sav"), encoding="utf-8") as f:
+            plsav = json.load(f)
+        plsav["InternalName"] = "电路"
+        path = os.path.join(Experiment.SAV_PATH_DIR, "__test_gbk__.sav")
+        with open(path, "wb") as f:
+            f.write(json.dumps(plsav, ensure_ascii=False).encode("gbk"))
+
+        expe = Experiment(OpenMode.load_by_filepath, path)
+        self.assertEqual(expe.PlSav["InternalName"], "电路")
+        expe.save(no_print_info=True)
+        expe.close()
+
+        # 保存后存档为utf-8编码, 不应再按之前检测出的gbk读取
+        expe = Experiment(OpenMode.load_by_filepath, path)
+        self.assertEqual(expe.PlSav["InternalName"], "电路")
+        self.assertEqual(expe.get_elements_count(), 91)
+        expe.close(delete=True)
+
+    def _assert_batch_matches_scalar(self, scalar_func, xyz, res, is_big):
+        for row, res_row, big in zip(xyz.tolist(), res.tolist(), is_big):
+            for expected, actual in zip(scalar_func(*row, is_bigElement=big), res_row):
+                self.assertAlmostEqual(expected, actual)
+
+    @unittest.skipUnless(np, "numpy is not installed")
+    def test_elementXYZ_batch(self):
+        xyz = np.array([[1, 2, 3], [4, 5, 6], [-1, 0, 2]])
+        mask = np.array([True, False, True])
+        cases = (
+            (False, [False] * 3),
+            (True, [True] * 3),
+            (np.bool_(True), [True] * 3),
+            (mask, mask.tolist()),
+        )
+        for batch_func, scalar_func in (
+            (elementXYZ_to_native_batch, elementXYZ_to_native),
+            (native_to_elementXYZ_batch, native_to_elementXYZ),
+        ):
+            for is_bigElement, is_big in cases:
+                res = batch_func(xyz, is_bigElement)
+                self._assert_batch_matches_scalar(scalar_func, xyz, res, is_big)
+            self.assertEqual(xyz.tolist(), [[1, 2, 3], [4, 5, 6], [-1, 0, 2]])
+
+            float_xyz = xyz.astype(float)
+            res = batch_func(float_xyz, mask, inplace=True)
+            self.assertIs(res, float_xyz)
+            self._assert_batch_matches_scalar(scalar_func, xyz, res, mask.tolist())
+
+            self.assertRaises(ValueError, batch_func, np.zeros((3, 2)))
+            self.assertRaises(ValueError, batch_func, xyz, np.array([True, False]))
+            self.assertRaises(TypeError, batch_func, xyz, inplace=True)
+            self.assertRaises(TypeError, batch_func, xyz.tolist())
+
+    @my_test_dec
+    def test_search_experiment_rewritten_sav(self):
+        expe = Experiment(OpenMode.crt, "__idx_a__", ExperimentType.Circuit, force_crt=True)
+        expe.save(no_print_info=True)
+        expe.close()
+        filename, plsav = search_experiment("__idx_a__")
+        self.assertIsNotNone(filename)
+
+        # 其他程序直接改写存档 (存档目录的修改时间不变)
+        path = os.path.join(Experiment.SAV_PATH_DIR, filename)
+        plsav["InternalName"] = "__idx_b__"
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(plsav, f)
+        # 合法的json, 但不是物实存档
+        no_name_path = os.path.join(Experiment.SAV_PATH_DIR, "__no_internal_name__.sav")
+        with open(no_name_path, "w", encoding="utf-8") as f:
+            json.dump({"Type": 0}, f)
+
+        try:
+            self.assertEqual(search_experiment("__idx_a__"), (None, None))
+            self.assertEqual(search_experiment("__idx_b__")[0], filename)
+        finally:
+            os.remove(path)
+            os.remove(no_name_path)
+
+    @my_test_dec
+    def test_load_bom_multiline_sav(self):
+        # 带BOM的utf-8存档, 且字符串中含有未转义的换行符
+        with Experiment(OpenMode.load_by_filepath, os.path.join(TEST_DATA_DIR, "BOM-Multiline-String.sav")) as expe:
+            self.assertEqual(expe.PlSav["Experiment"]["Subject"], "第一行\n第二行")
+            self.assertEqual(expe.get_elements_count(), 7)
+            expe.close()
+
+    @my_test_dec
+    def test_load_null_summary_keeps_template(self):
+        template_summary = copy.deepcopy(savTemplate.Circuit["Summary"])
+        # 该存档的Summary为null, 读取时会使用模板的Summary
+        expe = Experiment(OpenMode.load_by_filepath, os.path.join(TEST_DATA_DIR, "All-Circuit-Elements.sav"))
+        expe.entitle("__test_summary__")
+        expe.edit_tags(Tag.Circuit, Tag.KnowledgeBase)
+        self.assertEqual(expe.PlSav["Summary"]["Subject"], "__test_summary__")
+        expe.close()
+
+        self.assertEqual(savTemplate.Circuit["Summary"], template_summary)